@@ -1,106 +1,122 @@
 """
 Main Flask application for Sleep Optimizer Supervisor Agent.
 """
-from flask import Flask, jsonify, render_template, redirect, url_for, session
+import importlib
+import os
+import sys
+import tempfile
+
+# Make the project root importable once, up front, so every module below can
+# use plain absolute imports instead of per-module sys.path fallbacks.
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _BASE_DIR not in sys.path:
+    sys.path.insert(0, _BASE_DIR)
+
+import orjson
+from flask import Flask, Response, g, jsonify, render_template, redirect, url_for, session
 from flask_cors import CORS
+from jinja2 import FileSystemBytecodeCache
+
+from config import Config
+from utils.json_provider import OrjsonProvider
+from utils.logger import logger, setup_logger
 
-try:
-    from config import Config
-    from routes.auth import auth_bp
-    from routes.dashboard import dashboard_bp
-    from routes.memory import memory_bp
-    from routes.worker import worker_bp
-    from utils.logger import logger, setup_logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-    from config import Config
-    from routes.auth import auth_bp
-    from routes.dashboard import dashboard_bp
-    from routes.memory import memory_bp
-    from routes.worker import worker_bp
-    from utils.logger import logger, setup_logger
+# Blueprint registry: (module name, blueprint attribute)
+BLUEPRINTS = (
+    ('routes.auth', 'auth_bp'),
+    ('routes.dashboard', 'dashboard_bp'),
+    ('routes.memory', 'memory_bp'),
+    ('routes.worker', 'worker_bp'),
+    ('routes.api', 'api_bp'),
+    ('routes.profile', 'profile_bp'),
+)
 
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__, template_folder='templates', static_folder='static')
     app.config.from_object(Config)
-    
+    app.json = OrjsonProvider(app)
+
     # Configure CORS
     CORS(app, origins=Config.CORS_ORIGINS, supports_credentials=True)
-    
-    # Register blueprints
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(dashboard_bp)
-    app.register_blueprint(memory_bp)
-    app.register_blueprint(worker_bp)
-    
-    # Register internal API blueprint
-    try:
-        from routes.api import api_bp
-        app.register_blueprint(api_bp)
-    except ImportError:
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        from routes.api import api_bp
-        app.register_blueprint(api_bp)
-    
-    # Import and register profile blueprint
+
+    # Persist compiled Jinja templates to disk so a fresh worker (or a
+    # cold serverless invocation) loads cached bytecode instead of
+    # re-parsing every template on its first render. tempfile resolves
+    # to /tmp on Vercel, the only writable path there.
     try:
-        from routes.profile import profile_bp
-        app.register_blueprint(profile_bp)
-    except ImportError:
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        from routes.profile import profile_bp
-        app.register_blueprint(profile_bp)
-    
+        cache_dir = os.path.join(tempfile.gettempdir(), 'supervisor-jinja-cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    except OSError:
+        # No writable directory: fall back to in-memory compilation only.
+        pass
+
+    # Register blueprints. Modules (and their pymongo/werkzeug service
+    # chains) are imported here rather than at module top so that
+    # importing this module stays cheap until an application is created.
+    for module_name, attr in BLUEPRINTS:
+        app.register_blueprint(getattr(importlib.import_module(module_name), attr))
+
+    @app.before_request
+    def load_session_user():
+        """Resolve the session user id once per request onto flask.g.
+
+        The signed session cookie is verified on first access; reading
+        g.user_id afterwards is a plain attribute lookup instead of
+        another pass through the session machinery.
+        """
+        g.user_id = session.get('user_id')
+
     # Root endpoint
     @app.route('/', methods=['GET'])
     def root():
         """Root endpoint - redirect to login or dashboard."""
-        if session.get('user_id'):
+        if g.user_id:
             return redirect(url_for('dashboard.dashboard'))
         return redirect('/login')
-    
+
     @app.route('/login', methods=['GET'])
     def login_page():
         """Login page."""
-        if session.get('user_id'):
+        if g.user_id:
             return redirect('/dashboard')
         return render_template('login.html')
-    
+
     @app.route('/register', methods=['GET'])
     def register_page():
         """Registration page."""
-        if session.get('user_id'):
+        if g.user_id:
             return redirect('/dashboard')
         return render_template('register.html')
     
-    # Root endpoint with agent information
+    # Root endpoint with agent information. The payload only depends on
+    # Config constants, so serialize it once here and reuse the bytes;
+    # the handler just wraps them in a fresh Response (flask-cors and
+    # friends mutate response headers, so the Response itself can't be
+    # shared).
+    api_info_body = orjson.dumps({
+        'agent': Config.AGENT_NAME,
+        'agent_id': Config.AGENT_ID,
+        'version': Config.AGENT_VERSION,
+        'status': 'running',
+        'endpoints': {
+            'register': '/register',
+            'login': '/login',
+            'logout': '/logout',
+            'current_user': '/current-user',
+            'dashboard': '/dashboard',
+            'recommendations': '/api/recommendations',
+            'analyze': '/api/analyze',
+            'memory': '/api/memory',
+            'worker_health': '/api/worker/health'
+        }
+    })
+
     @app.route('/api', methods=['GET'])
     def api_info():
         """API information endpoint."""
-        return jsonify({
-            'agent': Config.AGENT_NAME,
-            'agent_id': Config.AGENT_ID,
-            'version': Config.AGENT_VERSION,
-            'status': 'running',
-            'endpoints': {
-                'register': '/register',
-                'login': '/login',
-                'logout': '/logout',
-                'current_user': '/current-user',
-                'dashboard': '/dashboard',
-                'recommendations': '/api/recommendations',
-                'analyze': '/api/analyze',
-                'memory': '/api/memory',
-                'worker_health': '/api/worker/health'
-            }
-        }), 200
+        return Response(api_info_body, status=200, mimetype='application/json')
     
     # Error handlers
     @app.errorhandler(404)
@@ -142,6 +158,7 @@ if __name__ == '__main__':
     app.run(
         debug=Config.DEBUG,
         host=Config.HOST,
-        port=Config.PORT
+        port=Config.PORT,
+        threaded=True
     )
 
@@ -1,10 +1,24 @@
 """
 Configuration settings for the Supervisor Agent.
 """
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+@functools.cache
+def load_env():
+    """Load .env into the environment at most once per process.
+
+    load_dotenv walks the filesystem looking for a .env file; caching
+    keeps repeated imports/calls free, and SKIP_DOTENV=1 skips the walk
+    entirely where the orchestrator already provides the environment.
+    """
+    if os.environ.get('SKIP_DOTENV', '').lower() not in ('1', 'true'):
+        load_dotenv()
+    return True
+
+# Must run before the Config class body reads os.environ below.
+load_env()
 
 class Config:
     """Configuration settings for the Supervisor Flask application"""
@@ -15,16 +29,16 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 3002))
     
-    # CORS configuration
-    CORS_ORIGINS = [
-        'http://localhost:3002',
-        'http://127.0.0.1:3002',
-        'http://localhost:8000',
-        'http://127.0.0.1:8000',
-        'http://localhost:5500',
-        'http://127.0.0.1:5500',
-        '*'  # Allow all for development
-    ]
+    # CORS configuration - exact origins only. The old '*' entry forced
+    # flask-cors onto its wildcard/regex path on every request (besides
+    # allowing any origin); extra origins come from the CORS_ORIGINS env
+    # var as a comma-separated list.
+    CORS_ORIGINS = [o.strip() for o in os.environ.get(
+        'CORS_ORIGINS',
+        'http://localhost:3002,http://127.0.0.1:3002,'
+        'http://localhost:8000,http://127.0.0.1:8000,'
+        'http://localhost:5500,http://127.0.0.1:5500'
+    ).split(',') if o.strip()]
     
     # Worker Agent configuration
     WORKER_AGENT_URL = os.environ.get('WORKER_AGENT_URL', 'http://localhost:8000')
@@ -36,6 +50,12 @@ class Config:
     # MongoDB configuration
     MONGODB_URI = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
     MONGODB_DB_NAME = os.environ.get('MONGODB_DB_NAME', 'supervisor')
+
+    # Redis configuration (optional - global state and the user cache
+    # fall back to process memory)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    GLOBAL_STATE_TTL = int(os.environ.get('GLOBAL_STATE_TTL', 86400))  # 24 hours
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))  # 5 minutes
     
     # Session configuration
     SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'False').lower() == 'true'
@@ -52,8 +72,9 @@ class Config:
     # Logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = os.environ.get('LOG_FILE', os.path.join(BASE_DIR, 'instance', 'logs', 'supervisor.log'))
-    
-    # API configuration
-    JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = False
+
+    # API configuration: compact, unsorted JSON output is guaranteed by
+    # the orjson provider installed in create_app. (Flask 3 ignores the
+    # legacy JSON_SORT_KEYS/JSONIFY_PRETTYPRINT_REGULAR keys that used
+    # to live here.)
 
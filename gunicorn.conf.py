@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Supervisor Agent.
+
+The route handlers are I/O-bound (MongoDB and Worker Agent round-trips),
+so threaded workers let one process overlap many in-flight requests
+instead of blocking a whole worker per request.
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 3002)}"
+
+# I/O-bound workload: a few processes, many threads each.
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+def post_fork(server, worker):
+    """Rebuild the MongoDB client per worker when the app is preloaded."""
+    from models.user import user_storage
+    user_storage.reconnect()
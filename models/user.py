@@ -1,46 +1,78 @@
 """
 User model and MongoDB storage for Supervisor Agent.
 """
-from datetime import datetime
+import functools
+import os
+import threading
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
+from cachetools import TTLCache
 from werkzeug.security import generate_password_hash, check_password_hash
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, DuplicateKeyError
+import bson
 from bson.objectid import ObjectId
 from config import Config
 from utils.logger import logger
 
+# Explicit scrypt parameters instead of Werkzeug's pbkdf2 default
+# (hundreds of thousands of SHA-256 iterations per login). scrypt runs in
+# OpenSSL at a tuned ~10ms cost, restoring auth throughput headroom.
+# check_password_hash reads the method from the stored hash, so existing
+# pbkdf2 hashes keep verifying.
+PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
+# Upper bound on candidate passwords fed to the KDF. Anything longer is
+# rejected before hashing so oversized inputs can't tie up a CPU core.
+MAX_PASSWORD_LENGTH = 4096
+
 class User:
-    """User model for authentication and profile management."""
-    
-    def __init__(self, username: str, password: str = None, user_id: str = None, 
+    """User model for authentication and profile management.
+
+    user_id is the string form of the MongoDB ObjectId (_id) - there is
+    deliberately no second id scheme or extra unique index.
+    """
+
+    def __init__(self, username: str, password: str = None, user_id: str = None,
                  profile: Dict[str, Any] = None):
         self.username = username
         self.user_id = user_id  # Will be set to str(ObjectId) after save
-        self.password_hash = generate_password_hash(password) if password else None
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD) if password else None
         self.profile = profile or {}
         self.created_at = None
         self.last_login = None
-    
+        self._dict_cache = None
+
     def set_password(self, password: str):
         """Set password hash."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
     
     def check_password(self, password: str) -> bool:
         """Check if password matches."""
         if not self.password_hash:
             return False
+        # Reject clearly invalid input before paying for the KDF.
+        if not password or len(password) > MAX_PASSWORD_LENGTH:
+            return False
         return check_password_hash(self.password_hash, password)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert user to dictionary."""
-        return {
-            'username': self.username,
-            'user_id': self.user_id,
-            'profile': self.profile,
-            'created_at': self.created_at,
-            'last_login': self.last_login
-        }
+        """Convert user to dictionary.
+
+        Built lazily on first use and reused for the instance's
+        lifetime (one request, typically). profile is shared by
+        reference, so in-place profile edits show through; reassigning
+        a scalar field after the first call would not.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'username': self.username,
+                'user_id': self.user_id,
+                'profile': self.profile,
+                'created_at': self.created_at,
+                'last_login': self.last_login
+            }
+        return self._dict_cache
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'User':
@@ -58,23 +90,83 @@ class User:
         user.last_login = data.get('last_login')
         return user
 
+@functools.lru_cache(maxsize=4096)
+def _object_id(user_id: str) -> ObjectId:
+    """Cached str -> ObjectId conversion.
+
+    The 24-char hex parse and validation is cheap but runs on every
+    authenticated request for the same handful of ids; the cache turns
+    repeats into a dict probe. Invalid ids still raise as before
+    (exceptions are not cached).
+    """
+    return ObjectId(user_id)
+
+def _create_client() -> MongoClient:
+    """Build the shared MongoClient with explicit pool tuning.
+
+    connect=False defers socket creation until first use, so preloaded
+    gunicorn workers open their own connections after fork instead of
+    inheriting the master's.
+    """
+    return MongoClient(
+        Config.MONGODB_URI,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=50,
+        minPoolSize=5,
+        maxIdleTimeMS=30000,
+        waitQueueTimeoutMS=2000,
+        connect=False
+    )
+
+def _create_redis_client():
+    """Optional Redis client for the cross-worker user cache.
+
+    The in-process TTL cache below is per worker; when REDIS_URL is
+    configured this shared layer means one worker's write invalidates
+    the entry every other worker sees. Returns None when Redis is not
+    configured or unavailable.
+    """
+    if not Config.REDIS_URL:
+        return None
+    try:
+        import redis
+        return redis.Redis.from_url(Config.REDIS_URL)
+    except Exception as e:
+        logger.error(f'Redis user cache unavailable: {str(e)}')
+        return None
+
+# Process-wide flag so index creation round-trips to Mongo at most once,
+# no matter how many storage instances are created (tests, preload forks).
+_indexes_ready = False
+
 class MongoUserStorage:
     """MongoDB-based user storage."""
-    
+
     def __init__(self):
         try:
-            self.client = MongoClient(Config.MONGODB_URI, serverSelectionTimeoutMS=5000)
+            self.client = _create_client()
             self.db = self.client[Config.MONGODB_DB_NAME]
             self.collection = self.db['users']
-            
-            # Create indexes
-            self.collection.create_index('username', unique=True)
-            self.collection.create_index('created_at')
-            
-            # Test connection
-            self.client.admin.command('ping')
+
+            # Short-TTL cache of raw user documents. Authenticated requests
+            # re-fetch the same user on every call, so this saves one Mongo
+            # round-trip per request in the common case. TTLCache is not
+            # thread-safe (even reads mutate its expiry links), so every
+            # access goes through _cache_lock — gthread workers hit this
+            # from many threads at once.
+            self._doc_cache = TTLCache(maxsize=4096, ttl=30)
+            self._cache_lock = threading.Lock()
+
+            # Optional shared write-through cache (see _create_redis_client)
+            self._redis = _create_redis_client()
+
+            # The client connects lazily and the first real query surfaces
+            # any connection problem; only force a round-trip when a boot
+            # healthcheck is explicitly requested.
+            if os.environ.get('MONGO_HEALTHCHECK') == '1':
+                self.client.admin.command('ping')
             logger.info(f"MongoDB user storage initialized: {Config.MONGODB_DB_NAME}")
-            
+
         except ConnectionFailure as e:
             logger.error(f"MongoDB connection failed: {str(e)}")
             raise
@@ -82,12 +174,71 @@ class MongoUserStorage:
             logger.error(f"MongoDB initialization error: {str(e)}")
             raise
     
+    def ensure_indexes(self):
+        """Create the users collection indexes once per process.
+
+        Runs lazily before the first write instead of in __init__, so
+        transient storage instances don't each pay index-creation
+        round-trips for indexes that already exist.
+        """
+        global _indexes_ready
+        if _indexes_ready:
+            return
+        try:
+            self.collection.create_index('username', unique=True)
+            self.collection.create_index('created_at')
+            _indexes_ready = True
+        except Exception as e:
+            logger.error(f'Error creating indexes: {str(e)}')
+
+    def _cache_doc(self, user_doc: Dict[str, Any]):
+        """Cache a raw user document under both lookup keys."""
+        with self._cache_lock:
+            self._doc_cache[f'id:{str(user_doc["_id"])}'] = user_doc
+            self._doc_cache[f'name:{user_doc["username"]}'] = user_doc
+        if self._redis:
+            try:
+                self._redis.setex(
+                    f'user:{str(user_doc["_id"])}',
+                    Config.USER_CACHE_TTL,
+                    bson.encode(user_doc)
+                )
+            except Exception as e:
+                logger.debug(f'Redis user cache write failed: {str(e)}')
+
+    def _redis_get_doc(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a user document in the shared Redis cache."""
+        if not self._redis:
+            return None
+        try:
+            raw = self._redis.get(f'user:{user_id}')
+            return bson.decode(raw) if raw else None
+        except Exception as e:
+            logger.debug(f'Redis user cache read failed: {str(e)}')
+            return None
+
+    def _invalidate_cache(self, user: User):
+        """Drop cached documents for a user after a write."""
+        with self._cache_lock:
+            if user.user_id:
+                self._doc_cache.pop(f'id:{user.user_id}', None)
+            self._doc_cache.pop(f'name:{user.username}', None)
+        if user.user_id and self._redis:
+            try:
+                self._redis.delete(f'user:{user.user_id}')
+            except Exception as e:
+                logger.debug(f'Redis user cache invalidation failed: {str(e)}')
+
     def save_user(self, user: User) -> bool:
         """Save user to MongoDB."""
         try:
+            self.ensure_indexes()
+
+            # Native BSON datetime: 8 bytes, index-friendly, no strptime
+            # on the way back out (vs. a ~26-char ISO string).
             if not user.created_at:
-                user.created_at = datetime.now().isoformat()
-            
+                user.created_at = datetime.now(timezone.utc)
+
             user_doc = {
                 'username': user.username,
                 'password_hash': user.password_hash,
@@ -98,14 +249,15 @@ class MongoUserStorage:
             
             # If user already has an ID, use it
             if user.user_id:
-                user_doc['_id'] = ObjectId(user.user_id)
+                user_doc['_id'] = _object_id(user.user_id)
                 # Update existing
-                self.collection.replace_one({'_id': ObjectId(user.user_id)}, user_doc, upsert=True)
+                self.collection.replace_one({'_id': _object_id(user.user_id)}, user_doc, upsert=True)
             else:
                 # Insert new
                 result = self.collection.insert_one(user_doc)
                 user.user_id = str(result.inserted_id)
-            
+
+            self._invalidate_cache(user)
             logger.info(f'User saved: {user.username} ({user.user_id})')
             return True
             
@@ -119,7 +271,12 @@ class MongoUserStorage:
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         try:
-            user_doc = self.collection.find_one({'username': username})
+            with self._cache_lock:
+                user_doc = self._doc_cache.get(f'name:{username}')
+            if user_doc is None:
+                user_doc = self.collection.find_one({'username': username})
+                if user_doc:
+                    self._cache_doc(user_doc)
             if user_doc:
                 return User.from_dict(user_doc)
             return None
@@ -132,7 +289,17 @@ class MongoUserStorage:
         try:
             if not user_id:
                 return None
-            user_doc = self.collection.find_one({'_id': ObjectId(user_id)})
+            with self._cache_lock:
+                user_doc = self._doc_cache.get(f'id:{user_id}')
+            if user_doc is None:
+                user_doc = self._redis_get_doc(user_id)
+                if user_doc is not None:
+                    with self._cache_lock:
+                        self._doc_cache[f'id:{user_id}'] = user_doc
+            if user_doc is None:
+                user_doc = self.collection.find_one({'_id': _object_id(user_id)})
+                if user_doc:
+                    self._cache_doc(user_doc)
             if user_doc:
                 return User.from_dict(user_doc)
             return None
@@ -140,10 +307,34 @@ class MongoUserStorage:
             logger.error(f'Error loading user by ID {user_id}: {str(e)}')
             return None
     
+    def user_id_exists(self, user_id: str) -> bool:
+        """Check if a user with this id exists.
+
+        Uses an _id-only projection so the existence probe moves ~24
+        bytes instead of the full document, and skips User construction
+        entirely.
+        """
+        try:
+            if not user_id:
+                return False
+            with self._cache_lock:
+                if f'id:{user_id}' in self._doc_cache:
+                    return True
+            return self.collection.find_one(
+                {'_id': _object_id(user_id)}, projection={'_id': 1}
+            ) is not None
+        except Exception as e:
+            logger.error(f'Error checking user existence by ID {user_id}: {str(e)}')
+            return False
+
     def user_exists(self, username: str) -> bool:
         """Check if user exists."""
         try:
-            return self.collection.count_documents({'username': username}) > 0
+            # find_one with an _id-only projection stops at the first index
+            # hit instead of counting every match like count_documents.
+            return self.collection.find_one(
+                {'username': username}, projection={'_id': 1}
+            ) is not None
         except Exception as e:
             logger.error(f'Error checking user existence: {str(e)}')
             return False
@@ -155,7 +346,7 @@ class MongoUserStorage:
                 return False
                 
             result = self.collection.update_one(
-                {'_id': ObjectId(user.user_id)},
+                {'_id': _object_id(user.user_id)},
                 {'$set': {
                     'username': user.username,
                     'password_hash': user.password_hash,
@@ -163,16 +354,29 @@ class MongoUserStorage:
                     'last_login': user.last_login
                 }}
             )
+            self._invalidate_cache(user)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f'Error updating user {user.username}: {str(e)}')
             return False
     
+    def reconnect(self):
+        """Re-create the MongoClient (for gunicorn post_fork hooks).
+
+        pymongo clients are not fork-safe: a preloaded app must rebuild
+        the client in each worker so monitoring threads and sockets are
+        not shared across processes.
+        """
+        self.client = _create_client()
+        self.db = self.client[Config.MONGODB_DB_NAME]
+        self.collection = self.db['users']
+
     def close(self):
         """Close MongoDB connection."""
         if hasattr(self, 'client'):
             self.client.close()
             logger.info("MongoDB connection closed")
 
-# Global user storage instance
+# Global user storage instance - the single MongoClient for the process.
+# Python's module cache guarantees this runs once per process.
 user_storage = MongoUserStorage()
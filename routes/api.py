@@ -3,17 +3,10 @@ Internal API routes for Worker Agent interaction.
 """
 from flask import Blueprint, request, jsonify
 from services.auth_service import auth_service
-# Assuming a global state service exists or using a simple mock for now if not found
-# I will check for a global state service, if not I'll implement a simple one here or in a service
-# Based on file list, there is no explicit global state service. I'll check services/ again.
-# For now I will implement the routes and use a placeholder or create a service.
+from services.state_store import state_store
 
 api_bp = Blueprint('api', __name__)
 
-# In-memory global state for demonstration if no DB is set up for it yet
-# In a real app this should be in a database
-global_state_store = {}
-
 @api_bp.route('/internal/api/verify_user/<user_id>', methods=['GET'])
 def verify_user(user_id):
     """Verify if a user exists."""
@@ -40,28 +33,24 @@ def get_user_profile(user_id):
 @api_bp.route('/internal/api/global_state/<user_id>', methods=['GET'])
 def get_global_state(user_id):
     """Get global state for a user."""
-    # Verify user first
-    user = auth_service.get_user_by_id(user_id)
-    if not user:
+    # Verify user first - existence probe only, the full document isn't needed
+    if not auth_service.user_id_exists(user_id):
         return jsonify({'error': 'User not found'}), 404
         
-    state = global_state_store.get(user_id, {})
+    state = state_store.get_state(user_id)
     return jsonify(state), 200
 
 @api_bp.route('/internal/api/global_state/<user_id>', methods=['POST'])
 def update_global_state(user_id):
     """Update global state for a user."""
-    # Verify user first
-    user = auth_service.get_user_by_id(user_id)
-    if not user:
+    # Verify user first - existence probe only, the full document isn't needed
+    if not auth_service.user_id_exists(user_id):
         return jsonify({'error': 'User not found'}), 404
     
     data = request.json
     if not data:
         return jsonify({'error': 'No data provided'}), 400
         
-    current_state = global_state_store.get(user_id, {})
-    current_state.update(data)
-    global_state_store[user_id] = current_state
-    
+    current_state = state_store.update_state(user_id, data)
+
     return jsonify({'status': 'success', 'state': current_state}), 200
@@ -3,15 +3,8 @@ Authentication routes for Supervisor Agent.
 """
 from flask import Blueprint, request, jsonify, session
 
-try:
-    from services.auth_service import auth_service
-    from utils.logger import logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from services.auth_service import auth_service
-    from utils.logger import logger
+from services.auth_service import auth_service
+from utils.logger import logger
 
 auth_bp = Blueprint('auth', __name__)
 
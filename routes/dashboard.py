@@ -1,44 +1,31 @@
 """
 Dashboard routes for Supervisor Agent.
 """
-import json
-from flask import Blueprint, request, jsonify, session, render_template
+import logging
+import orjson
+from flask import Blueprint, g, request, jsonify, render_template
 
-try:
-    from services.worker_client import worker_client
-    from services.auth_service import auth_service
-    from utils.logger import logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from services.worker_client import worker_client
-    from services.auth_service import auth_service
-    from utils.logger import logger
+from services.worker_client import worker_client
+from utils.auth import current_user_or_error, require_auth
+from utils.logger import logger
+from utils.responses import json_response
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-def require_auth():
-    """Check if user is authenticated."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return None, None
-    
-    user = auth_service.get_user_by_id(user_id)
-    if not user:
-        session.clear()
-        return None, None
-    
-    return user, None
+# Banner for multi-line log entries (hoisted so hot paths don't rebuild it)
+_BANNER = '=' * 80
 
 @dashboard_bp.route('/dashboard', methods=['GET'])
 def dashboard():
     """Main dashboard page."""
     try:
-        user, _ = require_auth()
+        # Unauthenticated visitors get the login page, not a JSON error,
+        # so this route resolves the user directly instead of using the
+        # decorator.
+        user, _ = current_user_or_error()
         if not user:
             return render_template('login.html'), 200
-        
+
         return render_template('dashboard.html', user=user.to_dict())
         
     except Exception as e:
@@ -46,21 +33,17 @@ def dashboard():
         return render_template('login.html'), 200
 
 @dashboard_bp.route('/api/recommendations', methods=['GET'])
+@require_auth
 def get_recommendations():
     """
     Get recommendations for current user.
     Triggers a fresh analysis using existing user data from worker agent's storage.
     """
     try:
-        user, _ = require_auth()
-        if not user:
-            return jsonify({
-                'error': 'Not authenticated',
-                'code': 'NOT_AUTHENTICATED'
-            }), 401
-        
-        logger.info(f'\n{"="*80}\nRECOMMENDATIONS ENDPOINT - REQUEST\n{"="*80}')
-        logger.info(f'User ID: {user.user_id}')
+        user = g.user
+
+        logger.info('\n%s\nRECOMMENDATIONS ENDPOINT - REQUEST\n%s', _BANNER, _BANNER)
+        logger.info('User ID: %s', user.user_id)
         logger.info('Triggering fresh analysis to generate recommendations...')
         
         # Trigger fresh analysis with existing data (no new sessions)
@@ -83,7 +66,7 @@ def get_recommendations():
                 'available': False
             }
         elif analysis_result.get('status') == 'error':
-            logger.error(f'Analysis error: {analysis_result.get("error")}')
+            logger.error('Analysis error: %s', analysis_result.get('error'))
             response = {
                 'sleep_score': None,
                 'confidence': None,
@@ -108,24 +91,19 @@ def get_recommendations():
             
             logger.info(f'Fresh analysis completed successfully')
         
-        # Log response being sent to client
-        logger.info(f'\n{"="*80}\nRECOMMENDATIONS ENDPOINT - RESPONSE TO CLIENT\n{"="*80}')
-        try:
-            response_str = json.dumps(response, indent=2)
-            logger.info(f'Response Data:\n{response_str}')
-        except Exception:
-            logger.info(f'Response Data: {response}')
-        
-        return jsonify(response), 200
+        # The worker client already logs the upstream response; no need
+        # to serialize the same payload again here.
+        return json_response(response)
         
     except Exception as e:
-        logger.error(f'Recommendations endpoint error: {str(e)}')
+        logger.error('Recommendations endpoint error: %s', str(e))
         return jsonify({
             'error': 'Internal server error',
             'code': 'INTERNAL_ERROR'
         }), 500
 
 @dashboard_bp.route('/api/analyze', methods=['POST'])
+@require_auth
 def analyze():
     """
     Trigger analysis via worker agent.
@@ -133,13 +111,8 @@ def analyze():
     all existing STM/LTM data for the user from its storage.
     """
     try:
-        user, _ = require_auth()
-        if not user:
-            return jsonify({
-                'error': 'Not authenticated',
-                'code': 'NOT_AUTHENTICATED'
-            }), 401
-        
+        user = g.user
+
         data = request.get_json()
         profile = data.get('profile', user.profile)
         
@@ -148,18 +121,19 @@ def analyze():
         sleep_sessions = data.get('sleep_sessions', [])
         
         # Log incoming request data
-        logger.info(f'\n{"="*80}\nANALYZE ENDPOINT - INCOMING REQUEST\n{"="*80}')
-        logger.info(f'User ID: {user.user_id}')
-        logger.info(f'New Sessions Count: {len(sleep_sessions)}')
-        try:
-            request_data = {
-                'profile': profile,
-                'sleep_sessions': sleep_sessions
-            }
-            request_str = json.dumps(request_data, indent=2)
-            logger.info(f'Request Data:\n{request_str}')
-        except Exception:
-            logger.info(f'Request Data: profile={profile}, sessions_count={len(sleep_sessions)}')
+        logger.info('\n%s\nANALYZE ENDPOINT - INCOMING REQUEST\n%s', _BANNER, _BANNER)
+        logger.info('User ID: %s', user.user_id)
+        logger.info('New Sessions Count: %s', len(sleep_sessions))
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                request_data = {
+                    'profile': profile,
+                    'sleep_sessions': sleep_sessions
+                }
+                request_str = orjson.dumps(request_data, option=orjson.OPT_INDENT_2).decode()
+                logger.debug('Request Data:\n%s', request_str)
+            except Exception:
+                logger.debug('Request Data: profile=%s, sessions_count=%s', profile, len(sleep_sessions))
         
         # Send task to worker agent
         # Backend will automatically map and retrieve all existing STM/LTM data
@@ -177,7 +151,7 @@ def analyze():
             }), 503
         
         if result.get('status') == 'error':
-            logger.error(f'Worker agent returned error: {result.get("error")}')
+            logger.error('Worker agent returned error: %s', result.get('error'))
             return jsonify({
                 'error': result.get('error', 'Analysis failed'),
                 'code': 'ANALYSIS_ERROR'
@@ -186,25 +160,15 @@ def analyze():
         # Extract result data
         analysis_result = result.get('result', {})
         
-        # Log response being sent to client
-        logger.info(f'\n{"="*80}\nANALYZE ENDPOINT - RESPONSE TO CLIENT\n{"="*80}')
-        try:
-            response_data = {
-                'success': True,
-                'result': analysis_result
-            }
-            response_str = json.dumps(response_data, indent=2)
-            logger.info(f'Response Data:\n{response_str}')
-        except Exception:
-            logger.info(f'Response Data: success=True, result_keys={list(analysis_result.keys()) if analysis_result else []}')
-        
-        return jsonify({
+        # The worker client already logs the upstream response; no need
+        # to serialize the same payload again here.
+        return json_response({
             'success': True,
             'result': analysis_result
-        }), 200
+        })
         
     except Exception as e:
-        logger.error(f'Analyze endpoint error: {str(e)}')
+        logger.error('Analyze endpoint error: %s', str(e))
         return jsonify({
             'error': 'Internal server error',
             'code': 'INTERNAL_ERROR'
@@ -1,39 +1,14 @@
 """
 Profile management routes for Supervisor Agent.
 """
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
 
-try:
-    from services.auth_service import auth_service
-    from utils.logger import logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from services.auth_service import auth_service
-    from utils.logger import logger
+from services.auth_service import auth_service
+from utils.auth import current_user_or_error
+from utils.logger import logger
 
 profile_bp = Blueprint('profile', __name__)
 
-def require_auth():
-    """Check if user is authenticated."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return None, jsonify({
-            'error': 'Not authenticated',
-            'code': 'NOT_AUTHENTICATED'
-        }), 401
-    
-    user = auth_service.get_user_by_id(user_id)
-    if not user:
-        session.clear()
-        return None, jsonify({
-            'error': 'User not found',
-            'code': 'USER_NOT_FOUND'
-        }), 404
-    
-    return user, None, None
-
 @profile_bp.route('/api/profile', methods=['GET'])
 def get_profile():
     """Get current user's profile."""
@@ -56,10 +31,10 @@ def get_profile():
             }), 200
         
         # Otherwise, use session-based authentication
-        user, error_response, status_code = require_auth()
+        user, error_response = current_user_or_error()
         if error_response:
-            return error_response, status_code
-        
+            return error_response
+
         return jsonify({
             'profile': user.profile,
             'user_id': user.user_id
@@ -89,9 +64,9 @@ def update_profile():
                 }), 404
         else:
             # Otherwise, use session-based authentication
-            user, error_response, status_code = require_auth()
+            user, error_response = current_user_or_error()
             if error_response:
-                return error_response, status_code
+                return error_response
         
         data = request.get_json()
         if not data:
@@ -1,20 +1,11 @@
 """
 Authentication service for Supervisor Agent.
 """
-from datetime import datetime
-from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-try:
-    from models.user import User, user_storage
-    from utils.logger import logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from models.user import User, user_storage
-    from utils.logger import logger
+from models.user import User, user_storage
+from utils.logger import logger
 
 class AuthService:
     """Handles authentication operations."""
@@ -68,8 +59,8 @@ class AuthService:
         if not user.check_password(password):
             return None, "Invalid username or password"
         
-        # Update last login
-        user.last_login = datetime.now().isoformat()
+        # Update last login (stored as a native BSON datetime)
+        user.last_login = datetime.now(timezone.utc)
         user_storage.update_user(user)
         
         logger.info(f'User authenticated: {username}')
@@ -80,5 +71,10 @@ class AuthService:
         """Get user by user_id."""
         return user_storage.get_user_by_id(user_id)
 
+    @staticmethod
+    def user_id_exists(user_id: str) -> bool:
+        """Check whether a user id exists without loading the document."""
+        return user_storage.user_id_exists(user_id)
+
 auth_service = AuthService()
 
@@ -0,0 +1,73 @@
+"""
+Global state storage for the Supervisor Agent.
+
+Uses Redis when REDIS_URL is configured so state is shared across
+workers, survives restarts, and is evicted by TTL. Falls back to a
+per-process dict for local development without Redis.
+"""
+import json
+import threading
+from typing import Dict, Any
+
+from config import Config
+from utils.logger import logger
+
+class InMemoryStateStore:
+    """Per-process fallback store (not shared across workers)."""
+
+    def __init__(self):
+        self._store = {}
+        # The app serves requests from multiple threads; without the lock
+        # a concurrent read-merge-assign loses updates.
+        self._lock = threading.Lock()
+
+    def get_state(self, user_id: str) -> Dict[str, Any]:
+        """Get state for a user."""
+        return self._store.get(user_id, {})
+
+    def update_state(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Atomically merge data into the user's state and return the result."""
+        with self._lock:
+            current = {**self._store.get(user_id, {}), **data}
+            self._store[user_id] = current
+        return current
+
+class RedisStateStore:
+    """Redis-backed store shared across workers, bounded by TTL."""
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._ttl = Config.GLOBAL_STATE_TTL
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f'gs:{user_id}'
+
+    def get_state(self, user_id: str) -> Dict[str, Any]:
+        """Get state for a user."""
+        raw = self._redis.hgetall(self._key(user_id))
+        return {k: json.loads(v) for k, v in raw.items()}
+
+    def update_state(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge data into the user's state hash and refresh its TTL."""
+        key = self._key(user_id)
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping={k: json.dumps(v) for k, v in data.items()})
+        pipe.expire(key, self._ttl)
+        pipe.execute()
+        return self.get_state(user_id)
+
+def _create_state_store():
+    """Pick the Redis store when configured, otherwise fall back to memory."""
+    if Config.REDIS_URL:
+        try:
+            store = RedisStateStore(Config.REDIS_URL)
+            logger.info('Global state store backed by Redis')
+            return store
+        except Exception as e:
+            logger.error(f'Redis state store unavailable, using in-memory fallback: {str(e)}')
+    return InMemoryStateStore()
+
+# Global state store instance
+state_store = _create_state_store()
@@ -1,19 +1,32 @@
 """
 Client for communicating with the Worker Agent.
 """
+import logging
+import re
+import threading
+import time
 import requests
-import json
+import orjson
+from secrets import token_hex
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 
-try:
-    from config import Config
-    from utils.logger import logger
-except ImportError:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from config import Config
-    from utils.logger import logger
+from cachetools import TTLCache
+
+from config import Config
+from utils.logger import logger
+
+# Banner for multi-line log entries (hoisted so hot paths don't rebuild it)
+_BANNER = '=' * 80
+
+# Pattern classifiers for get_recommendations, compiled once instead of
+# chained substring checks per pattern. Dict pattern types must match
+# 'issue' exactly (informational types like 'non-issue' stay out), so
+# the substring regex there carries only the problem/warning terms.
+_ISSUE_RE = re.compile(r'issue|problem|warning', re.IGNORECASE)
+_PROBLEM_RE = re.compile(r'problem|warning', re.IGNORECASE)
 
 class WorkerClient:
     """Client for Worker Agent API communication."""
@@ -21,21 +34,72 @@ class WorkerClient:
     def __init__(self, base_url: str = None):
         self.base_url = base_url or Config.WORKER_AGENT_URL
         self.timeout = Config.WORKER_AGENT_TIMEOUT
-    
+
+        # Pooled session with keep-alive: every call to the worker agent
+        # reuses an open connection instead of paying a fresh TCP (and
+        # TLS) handshake. The retry policy absorbs transient failures
+        # (worker restarts) with jittered exponential backoff; urllib3
+        # honors Retry-After on 503s by default, so a restarting worker
+        # can tell us when to come back instead of us surfacing an
+        # immediate 503 to the user.
+        self._session = requests.Session()
+        self._session.mount(self.base_url, HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET', 'POST']
+            )
+        ))
+
+        # Whether the worker agent accepts batched calls; flipped off on
+        # the first failed /batch attempt (see batch()).
+        self._batch_supported = True
+
+        # Pool for overlapping the per-call batch fallback; the pooled
+        # session above is thread-safe.
+        self._executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='worker-client'
+        )
+
+        # (monotonic timestamp, result) of the last upstream health
+        # check; bursts within the TTL reuse it (see check_health).
+        self._health_cache = (0.0, None)
+
+        # Per-user memory cache: repeated identical fetches from UI
+        # polling collapse into one upstream call. Invalidated when a
+        # task for the user completes (fresh analysis changes memory).
+        self._mem_cache = TTLCache(maxsize=4096, ttl=30)
+
+        # Same idea for the unparsed pass-through path (get_memory_raw);
+        # kept separate because it stores bytes, not dicts.
+        self._mem_raw_cache = TTLCache(maxsize=4096, ttl=30)
+
+        # TTLCache is not thread-safe (reads mutate its expiry links),
+        # and gthread workers hit this client from many threads; both
+        # memory caches share this lock.
+        self._mem_lock = threading.Lock()
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
         """Make HTTP request to worker agent."""
         url = f"{self.base_url}{endpoint}"
         
-        # Log request payload if present
-        if 'json' in kwargs:
+        # Log request payload if present. Serializing the full payload is
+        # DEBUG-only so production runs skip the extra encode entirely.
+        if 'json' in kwargs and logger.isEnabledFor(logging.DEBUG):
             try:
-                payload_str = json.dumps(kwargs['json'], indent=2)
-                logger.info(f'\n{"="*80}\nREQUEST PAYLOAD ({method} {endpoint}):\n{"="*80}\n{payload_str}\n{"="*80}')
+                payload_str = orjson.dumps(kwargs['json'], option=orjson.OPT_INDENT_2).decode()
+                logger.debug('\n%s\nREQUEST PAYLOAD (%s %s):\n%s\n%s\n%s',
+                             _BANNER, method, endpoint, _BANNER, payload_str, _BANNER)
             except Exception:
-                logger.info(f'REQUEST PAYLOAD ({method} {endpoint}): {kwargs.get("json")}')
+                logger.debug('REQUEST PAYLOAD (%s %s): %s', method, endpoint, kwargs.get('json'))
         
         try:
-            response = requests.request(
+            response = self._session.request(
                 method,
                 url,
                 timeout=self.timeout,
@@ -44,40 +108,110 @@ class WorkerClient:
             response.raise_for_status()
             result = response.json()
             
-            # Log response payload
-            try:
-                result_str = json.dumps(result, indent=2)
-                logger.info(f'\n{"="*80}\nRESPONSE PAYLOAD ({method} {endpoint}):\n{"="*80}\n{result_str}\n{"="*80}')
-            except Exception:
-                logger.info(f'RESPONSE PAYLOAD ({method} {endpoint}): {result}')
+            # Log response payload (DEBUG-only, same reasoning as above)
+            if logger.isEnabledFor(logging.DEBUG):
+                try:
+                    result_str = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+                    logger.debug('\n%s\nRESPONSE PAYLOAD (%s %s):\n%s\n%s\n%s',
+                                 _BANNER, method, endpoint, _BANNER, result_str, _BANNER)
+                except Exception:
+                    logger.debug('RESPONSE PAYLOAD (%s %s): %s', method, endpoint, result)
             
             return result
         except requests.exceptions.Timeout:
-            logger.error(f'Worker agent timeout: {endpoint}')
+            logger.error('Worker agent timeout: %s', endpoint)
             return None
         except requests.exceptions.ConnectionError:
-            logger.error(f'Worker agent connection error: {endpoint}')
+            logger.error('Worker agent connection error: %s', endpoint)
             return None
         except requests.exceptions.HTTPError as e:
-            logger.error(f'Worker agent HTTP error: {e.response.status_code} - {endpoint}')
+            logger.error('Worker agent HTTP error: %s - %s', e.response.status_code, endpoint)
             try:
                 error_body = e.response.json()
-                error_str = json.dumps(error_body, indent=2)
-                logger.error(f'Error response: {error_str}')
+                error_str = orjson.dumps(error_body, option=orjson.OPT_INDENT_2).decode()
+                logger.error('Error response: %s', error_str)
             except:
-                logger.error(f'Error response: {e.response.text}')
+                logger.error('Error response: %s', e.response.text)
             return None
         except Exception as e:
-            logger.error(f'Worker agent request error: {str(e)} - {endpoint}')
+            logger.error('Worker agent request error: %s - %s', str(e), endpoint)
             return None
     
+    def batch(self, calls: list) -> Optional[list]:
+        """
+        Execute several worker-agent calls in one HTTP round-trip.
+
+        Posts the calls as a JSON array to the worker's /batch endpoint
+        and returns the list of per-call results (parallel to the
+        input). Workers that definitively lack /batch (404/405) are
+        remembered and the calls are executed individually instead;
+        transient transport failures fall back for the current batch
+        only, so callers always get the same shape back.
+
+        Args:
+            calls: List of (method, endpoint, payload) tuples; payload
+                   may be None for GET-style calls.
+
+        Returns:
+            List of result dicts (None entries for failed calls), or
+            None if every call failed.
+        """
+        if self._batch_supported:
+            body = [
+                {'method': method, 'endpoint': endpoint, 'payload': payload}
+                for method, endpoint, payload in calls
+            ]
+            try:
+                response = self._session.post(
+                    f'{self.base_url}/batch', json=body, timeout=self.timeout
+                )
+                if response.status_code in (404, 405):
+                    # Definitive signal: this worker has no /batch
+                    # endpoint. Only this latches per-call mode on.
+                    logger.info('Worker agent has no /batch endpoint, using per-call requests')
+                    self._batch_supported = False
+                else:
+                    response.raise_for_status()
+                    result = response.json()
+                    if isinstance(result, list) and len(result) == len(calls):
+                        return result
+                    # Unexpected shape: fall back for this batch but
+                    # keep trying /batch on later calls.
+                    logger.warning('Malformed /batch response, falling back to per-call requests')
+            except requests.exceptions.RequestException as e:
+                # Transient transport failure (worker restarting, etc.);
+                # batching stays enabled for the next attempt.
+                logger.error('Worker agent /batch error: %s', str(e))
+
+        # Per-call mode: run the calls concurrently so total latency is
+        # bounded by the slowest call rather than their sum.
+        def _call(call):
+            method, endpoint, payload = call
+            if payload is not None:
+                return self._make_request(method, endpoint, json=payload)
+            return self._make_request(method, endpoint)
+
+        results = list(self._executor.map(_call, calls))
+        return results if any(r is not None for r in results) else None
+
     def register_worker(self) -> Optional[Dict[str, Any]]:
         """Register with worker agent."""
         return self._make_request('POST', '/register')
     
+    # How long a health-check result stays fresh. Dashboard polling and
+    # load-balancer probes within this window collapse into one upstream
+    # call.
+    HEALTH_CACHE_TTL = 5
+
     def check_health(self) -> Optional[Dict[str, Any]]:
-        """Check worker agent health."""
-        return self._make_request('GET', '/health')
+        """Check worker agent health (cached for a few seconds)."""
+        ts, cached = self._health_cache
+        if cached is not None and time.monotonic() - ts < self.HEALTH_CACHE_TTL:
+            return cached
+        result = self._make_request('GET', '/health')
+        if result is not None:
+            self._health_cache = (time.monotonic(), result)
+        return result
     
     def send_task(self, user_id: str, profile: Dict[str, Any], 
                   sleep_sessions: list = None) -> Optional[Dict[str, Any]]:
@@ -98,8 +232,7 @@ class WorkerClient:
         Returns:
             Task result or None on error
         """
-        import uuid
-        task_id = f"task_{uuid.uuid4().hex[:8]}"
+        task_id = f"task_{token_hex(4)}"
         
         # sleep_sessions is optional - backend will fetch existing data
         if sleep_sessions is None:
@@ -114,38 +247,97 @@ class WorkerClient:
             }
         }
         
-        logger.info(f'\n{"="*80}\nSENDING TASK TO WORKER AGENT\n{"="*80}')
-        logger.info(f'Task ID: {task_id}')
-        logger.info(f'User ID: {user_id}')
-        logger.info(f'New Sessions Count: {len(sleep_sessions)}')
-        logger.info(f'Backend will automatically fetch existing STM/LTM data for this user.')
-        
         result = self._make_request('POST', '/task', json=payload)
-        
-        if result and result.get('status') == 'completed':
-            logger.info(f'\n{"="*80}\nTASK COMPLETED SUCCESSFULLY\n{"="*80}')
-            logger.info(f'Task ID: {task_id}')
-        elif result and result.get('status') == 'error':
-            logger.error(f'\n{"="*80}\nTASK FAILED\n{"="*80}')
-            logger.error(f'Task ID: {task_id}')
-            logger.error(f'Error: {result.get("error")}')
-        
+
+        # Fresh analysis changes the stored memory; drop the stale entries.
+        with self._mem_lock:
+            self._mem_cache.pop(user_id, None)
+            self._mem_raw_cache.pop(user_id, None)
+
+        # _make_request already logs both sides of the HTTP call; one
+        # summary line per task is enough here.
+        status = result.get('status') if result else 'unavailable'
+        if status == 'error':
+            logger.error('task %s user=%s status=error error=%s',
+                         task_id, user_id, result.get('error'))
+        else:
+            logger.info('task %s user=%s sessions=%s status=%s',
+                        task_id, user_id, len(sleep_sessions), status)
+
         return result
     
-    def get_memory(self, user_id: str) -> Optional[Dict[str, Any]]:
+    def get_memory(self, user_id: str, force: bool = False) -> Optional[Dict[str, Any]]:
         """
-        Get user memory from worker agent.
-        
+        Get user memory from worker agent (cached briefly per user).
+
         Args:
             user_id: User identifier
-        
+            force: Bypass the cache for a manual refresh
+
         Returns:
             Memory data or None on error
         """
-        logger.info(f'\n{"="*80}\nFETCHING MEMORY FROM WORKER AGENT\n{"="*80}')
-        logger.info(f'User ID: {user_id}')
-        return self._make_request('GET', f'/memory?user_id={user_id}')
-    
+        if not force:
+            with self._mem_lock:
+                cached = self._mem_cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        logger.info('\n%s\nFETCHING MEMORY FROM WORKER AGENT\n%s', _BANNER, _BANNER)
+        logger.info('User ID: %s', user_id)
+        result = self._make_request('GET', '/memory', params={'user_id': user_id})
+        if result is not None:
+            with self._mem_lock:
+                self._mem_cache[user_id] = result
+        return result
+
+    def get_memory_raw(self, user_id: str) -> tuple:
+        """
+        Get user memory as unparsed JSON bytes (cached briefly per user).
+
+        For pure pass-through responses: the /api/memory route hands the
+        worker's JSON straight to the client, so parsing it here just to
+        re-serialize it in the route is wasted work on large LTM
+        payloads. stream=True defers the body read past the status line;
+        .content then pulls it in one pass with no decode.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            (body bytes, status code), or (None, None) on transport error
+        """
+        with self._mem_lock:
+            cached = self._mem_raw_cache.get(user_id)
+        if cached is not None:
+            return cached, 200
+
+        url = f'{self.base_url}/memory'
+        try:
+            response = self._session.get(
+                url,
+                params={'user_id': user_id},
+                timeout=self.timeout,
+                stream=True
+            )
+            body = response.content
+            if response.status_code == 200:
+                # The route splices these bytes verbatim into a JSON
+                # envelope, so an empty or non-JSON body (proxy error
+                # page, truncated response) must not be returned - let
+                # alone cached - or we'd serve invalid JSON for the TTL.
+                stripped = body.lstrip()
+                if not stripped or stripped[:1] not in (b'{', b'['):
+                    logger.error('Worker agent /memory returned non-JSON body')
+                    return None, None
+                with self._mem_lock:
+                    self._mem_raw_cache[user_id] = body
+            return body, response.status_code
+        except requests.exceptions.RequestException as e:
+            logger.error('Worker agent memory fetch error: %s', str(e))
+            return None, None
+
+
     def get_recommendations(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
         Get recommendations for user.
@@ -157,44 +349,45 @@ class WorkerClient:
         Returns:
             Recommendations data or None on error
         """
-        logger.info(f'\n{"="*80}\nFETCHING RECOMMENDATIONS FROM WORKER AGENT\n{"="*80}')
-        logger.info(f'User ID: {user_id}')
+        logger.info('\n%s\nFETCHING RECOMMENDATIONS FROM WORKER AGENT\n%s', _BANNER, _BANNER)
+        logger.info('User ID: %s', user_id)
         
         memory = self.get_memory(user_id)
         if not memory:
             logger.warning('No memory data received, returning None')
             return None
         
-        # Extract recommendations from LTM
-        ltm = memory.get('ltm', {})
-        
+        # Extract recommendations from LTM. Bind the nested dicts once
+        # instead of re-walking memory['ltm']['trends'] per field.
+        ltm = memory.get('ltm') or {}
+        trends = ltm.get('trends') or {}
+
         # Get recommendations, sleep_score, and confidence from LTM
         # They can be at the top level of LTM or in trends
         recommendations = ltm.get('recommendations', {})
         sleep_score = ltm.get('sleep_score')
         if sleep_score is None:
-            sleep_score = ltm.get('trends', {}).get('avg_sleep_score')
-        
+            sleep_score = trends.get('avg_sleep_score')
+
         confidence = ltm.get('confidence')
         if confidence is None:
-            confidence = ltm.get('trends', {}).get('confidence')
-        
+            confidence = trends.get('confidence')
+
         personalized_tips = ltm.get('personalized_tips', [])
-        
+
         # Get issues from LTM (saved directly) or extract from patterns
         issues = ltm.get('issues', [])
-        
+
         # If no issues in LTM, try to extract from patterns (filter out non-issue patterns)
         if not issues:
-            patterns = ltm.get('patterns', [])
-            for pattern in patterns:
+            for pattern in ltm.get('patterns', []):
                 if isinstance(pattern, dict):
                     pattern_type = pattern.get('type', '')
                     # Only include actual issues, not informational patterns
-                    if pattern_type == 'issue' or 'problem' in pattern_type.lower() or 'warning' in pattern_type.lower():
+                    if pattern_type == 'issue' or _PROBLEM_RE.search(pattern_type):
                         issues.append(pattern.get('description', ''))
                 elif isinstance(pattern, str):
-                    if 'issue' in pattern.lower() or 'problem' in pattern.lower():
+                    if _ISSUE_RE.search(pattern):
                         issues.append(pattern)
         
         result = {
@@ -205,12 +398,14 @@ class WorkerClient:
             'personalized_tips': personalized_tips
         }
         
-        # Log extracted recommendations
-        try:
-            result_str = json.dumps(result, indent=2)
-            logger.info(f'\n{"="*80}\nEXTRACTED RECOMMENDATIONS:\n{"="*80}\n{result_str}\n{"="*80}')
-        except Exception:
-            logger.info(f'EXTRACTED RECOMMENDATIONS: {result}')
+        # Log extracted recommendations (DEBUG-only)
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                result_str = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+                logger.debug('\n%s\nEXTRACTED RECOMMENDATIONS:\n%s\n%s\n%s',
+                             _BANNER, _BANNER, result_str, _BANNER)
+            except Exception:
+                logger.debug('EXTRACTED RECOMMENDATIONS: %s', result)
         
         return result
 
@@ -0,0 +1,76 @@
+"""
+Shared authentication helpers for Supervisor Agent routes.
+
+Replaces the per-blueprint require_auth copies: one implementation, one
+place to fix, and the error payloads are serialized once at import
+instead of rebuilt through jsonify on every rejected request.
+"""
+from functools import wraps
+
+import orjson
+from flask import Response, g, session
+
+from services.auth_service import auth_service
+
+# Constant error bodies, encoded once. Each rejection still gets its own
+# Response object because flask-cors mutates response headers per
+# request, so the Response itself cannot be shared.
+_UNAUTH_BODY = orjson.dumps({
+    'error': 'Not authenticated',
+    'code': 'NOT_AUTHENTICATED'
+})
+_NOT_FOUND_BODY = orjson.dumps({
+    'error': 'User not found',
+    'code': 'USER_NOT_FOUND'
+})
+
+def _error(body: bytes, status: int) -> Response:
+    return Response(body, status=status, mimetype='application/json')
+
+def current_user_or_error():
+    """Resolve the session user, caching it on g for the request.
+
+    Returns (user, None) when authenticated, or (None, error Response)
+    for anonymous sessions (401) and stale session ids (404, with the
+    session cleared). Route code that needs custom unauthenticated
+    behavior (e.g. the dashboard's login-page fallback) can call this
+    directly instead of using the decorator.
+    """
+    if not g.user_id:
+        return None, _error(_UNAUTH_BODY, 401)
+    user = g.get('user')
+    if user is None:
+        user = auth_service.get_user_by_id(g.user_id)
+        if not user:
+            session.clear()
+            return None, _error(_NOT_FOUND_BODY, 404)
+        g.user = user
+    return user, None
+
+def require_auth(view):
+    """Decorator: load the session user onto g.user or reject the request."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        _, error = current_user_or_error()
+        if error is not None:
+            return error
+        return view(*args, **kwargs)
+    return wrapper
+
+def require_auth_id(view):
+    """Decorator variant for routes that only need g.user_id.
+
+    Verifies the session user exists via the cache-backed existence
+    probe instead of loading the full document; the handler reads
+    g.user_id directly.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = g.user_id
+        if not user_id:
+            return _error(_UNAUTH_BODY, 401)
+        if 'user' not in g and not auth_service.user_id_exists(user_id):
+            session.clear()
+            return _error(_NOT_FOUND_BODY, 404)
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,27 @@
+"""
+orjson-backed JSON provider for the Flask application.
+"""
+import orjson
+from flask.json.provider import JSONProvider
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes through orjson.
+
+    orjson encodes in C with SIMD-accelerated UTF-8 handling and skips
+    ensure_ascii, so every jsonify response serializes several times
+    faster than with the stdlib json module.
+
+    Output is always compact and preserves insertion order: no
+    pretty-printing whitespace on the wire and no O(n log n) key sort
+    per response.
+    """
+
+    # OPT_NAIVE_UTC/OPT_UTC_Z render the BSON datetimes stored by
+    # MongoUserStorage as ISO-8601 UTC strings at the HTTP boundary.
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
@@ -1,8 +1,11 @@
 """
 Logging utility for Supervisor Agent.
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 from config import Config
 
@@ -19,13 +22,29 @@ def setup_logger():
             if log_dir and not os.path.exists(log_dir):
                 os.makedirs(log_dir, exist_ok=True)
 
-            file_handler = logging.FileHandler(Config.LOG_FILE)
+            file_handler = logging.handlers.RotatingFileHandler(
+                Config.LOG_FILE, maxBytes=50_000_000, backupCount=5
+            )
             file_handler.setLevel(logging.DEBUG)
             file_formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+
+            # Non-blocking file logging: records go onto an in-process
+            # queue and a background listener thread does the disk I/O,
+            # so request threads never wait on the filesystem.
+            log_queue = queue.Queue(-1)
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            listener = logging.handlers.QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            listener.start()
+            # Drain anything still queued (e.g. final ERROR lines from a
+            # crashing worker) before the interpreter exits; the monitor
+            # thread is a daemon and would otherwise drop them.
+            atexit.register(listener.stop)
+            logger.addHandler(queue_handler)
         except OSError:
             # Fallback for read-only file systems (like Vercel)
             pass
@@ -0,0 +1,21 @@
+"""
+Response helpers for the Supervisor Agent.
+"""
+import orjson
+from flask import Response
+
+from utils.json_provider import OrjsonProvider
+
+def json_response(data, status: int = 200) -> Response:
+    """Build a JSON response directly from orjson-encoded bytes.
+
+    jsonify decodes the serialized payload to str and Flask re-encodes
+    it to bytes on the way out; handing Response the bytes skips that
+    copy and encode pass, which matters for the large analysis/memory
+    payloads. Uses the same orjson options as the app's JSON provider.
+    """
+    return Response(
+        orjson.dumps(data, option=OrjsonProvider.option),
+        status=status,
+        mimetype='application/json'
+    )